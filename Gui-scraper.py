@@ -1,15 +1,27 @@
 import tkinter as tk
 from tkinter import ttk, filedialog
 import threading
+import queue
 import concurrent.futures
+import asyncio
+import aiohttp
 import requests
+import ahocorasick
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING as URLLIB3_ACCEPT_ENCODING
 import csv
-import random
+import gzip
+import io
+import zlib
+import itertools
 import time
-import json
+import orjson
 import logging
-from urllib.parse import urljoin
-from bs4 import BeautifulSoup
+import socket
+import functools
+from urllib.parse import urljoin, urlsplit
+import lxml.html
+from lxml import etree
 from datetime import datetime, timedelta
 
 
@@ -22,14 +34,93 @@ logging.basicConfig(
 )
 
 
+# 1. Session HTTP partagée (keep-alive + pool de connexions)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+REQUEST_TIMEOUT = (5, 30)  # (connexion, lecture) en secondes
+
+# Compression du transfert : urllib3 n'annonce "br" que si brotli est
+# installé (sinon la réponse ne pourrait pas être décodée). aiohttp fait
+# de même de son côté.
+ACCEPT_ENCODING = ", ".join(URLLIB3_ACCEPT_ENCODING.split(","))
+
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING})
+
+# La récupération des sitemaps est séquentielle : une connexion keep-alive
+# réutilisée par hôte suffit
+SESSION_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=1)
+SESSION.mount("http://", SESSION_ADAPTER)
+SESSION.mount("https://", SESSION_ADAPTER)
+
+# Cache DNS : requests/urllib3 appellent socket.getaddrinfo à chaque nouvelle
+# connexion. Les résultats sont mémorisés par fenêtre de DNS_CACHE_TTL secondes.
+DNS_CACHE_TTL = 300
+_system_getaddrinfo = socket.getaddrinfo
+
+@functools.lru_cache(maxsize=256)
+def _cached_getaddrinfo(ttl_window, *args, **kwargs):
+    return _system_getaddrinfo(*args, **kwargs)
+
+def _getaddrinfo(*args, **kwargs):
+    return list(_cached_getaddrinfo(int(time.monotonic() // DNS_CACHE_TTL), *args, **kwargs))
+
+socket.getaddrinfo = _getaddrinfo
+
+# XPath compilés une seule fois au chargement du module et réutilisés à
+# chaque appel (y compris dans la récursion sur les sitemapindex).
+# local-name() accepte les sitemaps avec ou sans namespace, comme l'ancienne
+# recherche par suffixe ; les chemins sont relatifs à la racine pour ne
+# parcourir que ses enfants directs.
+_SITEMAP_PARSER = etree.XMLParser(resolve_entities=False)
+_SUB_XP = etree.XPath("*[local-name()='sitemap']/*[local-name()='loc']/text()")
+_LOC_XP = etree.XPath("*[local-name()='url']/*[local-name()='loc']/text()")
+
+# Taille maximale d'un sitemap décompressé (limite du protocole sitemaps.org)
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+
+# Extraction du contenu des pages (un seul parcours pour les six niveaux de titres)
+_UTF8_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+_HEADINGS_XP = etree.XPath("//*[self::h1 or self::h2 or self::h3 or self::h4 or self::h5 or self::h6]")
+_PARAGRAPHS_XP = etree.XPath("//p")
+_IMAGES_XP = etree.XPath("//img[@src]")
+# Texte visible, sans <script>/<style>/<template> (comme get_text de BeautifulSoup)
+_TEXT_XP = etree.XPath("descendant-or-self::text()[not(ancestor::script or ancestor::style or ancestor::template)]")
+_META_XP = etree.XPath("//meta[@name='description' or @name='keywords' or @property='og:title']")
+_META_FIELDS = {
+    ('name', 'description'): 'meta_description',
+    ('name', 'keywords'): 'meta_keywords',
+    ('property', 'og:title'): 'meta_og_title',
+}
+
 
 class URLCollector:
     """
     Classe pour collecter les URLs avec une limite globale.
     """
+    PREALLOC_MAX = 100_000  # emplacements réservés au plus d'avance
+    
     def __init__(self, limit=0):
         self.limit = limit  # 0 = illimité
-        self.urls = []
+        # Avec une limite, la liste est préallouée (jusqu'à PREALLOC_MAX) et
+        # remplie par tranches ; au-delà, l'affectation par tranche l'agrandit
+        self._urls = [None] * min(limit, self.PREALLOC_MAX) if limit > 0 else []
+        self._idx = 0
+    
+    @property
+    def urls(self):
+        """Liste des URLs collectées (sans les emplacements encore vides)."""
+        if self._idx < len(self._urls):
+            return self._urls[:self._idx]
+        return self._urls
+    
+    @property
+    def full(self):
+        """True si la limite est atteinte (jamais si illimité)."""
+        return self.limit > 0 and self._idx >= self.limit
+    
+    def __len__(self):
+        return self._idx
     
     def add_urls(self, new_urls):
         """
@@ -37,34 +128,113 @@ class URLCollector:
         Retourne False si la limite est atteinte, True sinon.
         """
         if self.limit <= 0:
-            self.urls.extend(new_urls)
-            return True
-        remaining = self.limit - len(self.urls)
-        if remaining <= 0:
-            return False
-        if len(new_urls) > remaining:
-            self.urls.extend(new_urls[:remaining])
-            return False
-        else:
-            self.urls.extend(new_urls)
+            self._urls.extend(new_urls)
+            self._idx += len(new_urls)
             return True
+        n = min(len(new_urls), self.limit - self._idx)
+        self._urls[self._idx:self._idx + n] = new_urls[:n]
+        self._idx += n
+        return self._idx < self.limit
+
+def build_disallowed_matcher(disallowed_fragments: list):
+    """
+    Compile les fragments interdits en un automate Aho-Corasick, qui
+    trouve n'importe quel fragment en un seul passage sur l'URL.
+    Retourne None si aucun fragment n'est fourni.
+    """
+    fragments = [fragment for fragment in disallowed_fragments if fragment]
+    if not fragments:
+        return None
+    automaton = ahocorasick.Automaton()
+    for fragment in fragments:
+        automaton.add_word(fragment, fragment)
+    automaton.make_automaton()
+    return automaton
+
+class TokenBucket:
+    """
+    Limiteur de débit global partagé par tous les workers (threads ou
+    coroutines) : 'rate_per_s' jetons par seconde, au plus 'capacity'
+    jetons en réserve.
+    """
+    def __init__(self, rate_per_s: float, capacity: float = 1):
+        self.rate_per_s = rate_per_s
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+    
+    @classmethod
+    def from_delays(cls, min_delay: float, max_delay: float):
+        """
+        Une requête par délai moyen entre min_delay et max_delay.
+        Retourne None si ce délai est nul (pas de limite).
+        """
+        avg_delay = (min_delay + max_delay) / 2
+        if avg_delay <= 0:
+            return None
+        return cls(rate_per_s=1.0 / avg_delay)
+    
+    def reserve(self) -> float:
+        """
+        Réserve un jeton et retourne le temps (en secondes) à attendre avant
+        de l'utiliser. Le solde peut devenir négatif : les réservations
+        suivantes attendent d'autant plus longtemps.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate_per_s)
+            self.last_refill = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate_per_s
 
-def is_allowed(url: str, disallowed_fragments: list) -> bool:
+def is_allowed(url: str, matcher) -> bool:
     """Retourne False si l'URL contient un fragment interdit, True sinon."""
-    return not any(fragment in url for fragment in disallowed_fragments)
+    if matcher is None:
+        return True
+    # S'arrête dès la première correspondance
+    return next(matcher.iter(url), None) is None
+
+def filter_allowed_urls(urls: list, matcher, max_count=0) -> list:
+    """
+    Filtre une liste d'URLs en un seul passage.
+    Si max_count > 0, s'arrête dès que max_count URLs autorisées sont trouvées.
+    """
+    if matcher is None:
+        return urls[:max_count] if max_count > 0 else urls
+    matcher_iter = matcher.iter
+    allowed = (u for u in urls if next(matcher_iter(u), None) is None)
+    if max_count > 0:
+        allowed = itertools.islice(allowed, max_count)
+    return list(allowed)
+
+def _gunzip_sitemap(content: bytes) -> bytes:
+    """
+    Décompresse un fichier .xml.gz sans dépasser SITEMAP_MAX_BYTES.
+    Lève ValueError si le fichier décompressé est trop volumineux.
+    """
+    with gzip.GzipFile(fileobj=io.BytesIO(content)) as f:
+        data = f.read(SITEMAP_MAX_BYTES + 1)
+    if len(data) > SITEMAP_MAX_BYTES:
+        raise ValueError(f"sitemap décompressé supérieur à {SITEMAP_MAX_BYTES} octets")
+    return data
 
-def get_sitemap_urls(sitemap_url: str, collector: URLCollector, disallowed: list, log_callback=None) -> list:
+def get_sitemap_urls(sitemap_url: str, collector: URLCollector, matcher, log_callback=None):
     """
     Récupère (récursivement) toutes les URLs (<loc>) depuis un sitemap:
       - Si on trouve un <sitemapindex>, parcourt chaque sous-sitemap.
       - Sinon, on suppose un <urlset> et on récupère les <loc>.
-    Ajoute uniquement les URLs autorisées dans le collector jusqu'à la limite.
+    Ajoute uniquement les URLs autorisées (voir build_disallowed_matcher)
+    dans le collector jusqu'à la limite. Ne retourne rien : lire
+    collector.urls une fois la collecte terminée.
     """
-    if collector.limit > 0 and len(collector.urls) >= collector.limit:
-        return collector.urls
+    if collector.full:
+        return
     
     try:
-        resp = requests.get(sitemap_url, headers={"User-Agent": "Mozilla/5.0"})
+        resp = SESSION.get(sitemap_url, timeout=REQUEST_TIMEOUT)
         resp.raise_for_status()
         message = f"[OK] Récupération sitemap: {sitemap_url} (status={resp.status_code})"
         logging.info(message)
@@ -75,46 +245,52 @@ def get_sitemap_urls(sitemap_url: str, collector: URLCollector, disallowed: list
         logging.error(message)
         if log_callback:
             log_callback(message)
-        return []
+        return
     
-    soup = BeautifulSoup(resp.content, "xml")
+    try:
+        content = resp.content
+        # Fichier .xml.gz servi tel quel (et non via Content-Encoding)
+        if content[:2] == b"\x1f\x8b":
+            content = _gunzip_sitemap(content)
+        root = etree.fromstring(content, parser=_SITEMAP_PARSER)
+    except (etree.XMLSyntaxError, OSError, EOFError, zlib.error, ValueError) as e:
+        message = f"[WARN] '{sitemap_url}' n'est pas un XML valide: {e}"
+        logging.warning(message)
+        if log_callback:
+            log_callback(message)
+        return
     
-    # Vérifier s'il y a un <sitemapindex>
-    sitemapindex_tag = soup.find(lambda t: t.name and t.name.lower().endswith("sitemapindex"))
-    if sitemapindex_tag:
-        sitemap_tags = sitemapindex_tag.find_all(
-            lambda t: t.name and t.name.lower().endswith("sitemap"), recursive=True
-        )
-        for tag in sitemap_tags:
-            if collector.limit > 0 and len(collector.urls) >= collector.limit:
+    # Le type de sitemap se déduit du seul élément racine (namespace ignoré)
+    root_tag = etree.QName(root).localname.lower()
+    
+    # Vérifier s'il s'agit d'un <sitemapindex>
+    if root_tag == "sitemapindex":
+        for sub_sitemap_url in _SUB_XP(root):
+            if collector.full:
                 break
-            loc_tag = tag.find(lambda x: x.name and x.name.lower().endswith("loc"))
-            if loc_tag:
-                sub_sitemap_url = loc_tag.text.strip()
-                if log_callback:
-                    log_callback(f"[INFO] Traitement du sous-sitemap: {sub_sitemap_url}")
-                get_sitemap_urls(sub_sitemap_url, collector, disallowed, log_callback)
-        return collector.urls
-    
-    # Sinon, supposer un <urlset>
-    urlset_tag = soup.find(lambda t: t.name and t.name.lower().endswith("urlset"))
-    if urlset_tag:
-        loc_tags = urlset_tag.find_all(lambda x: x.name and x.name.lower().endswith("loc"))
-        urls = [tag.get_text(strip=True) for tag in loc_tags]
-        # Filtrer les URLs autorisées
-        allowed_urls = [u for u in urls if is_allowed(u, disallowed)]
+            sub_sitemap_url = sub_sitemap_url.strip()
+            if log_callback:
+                log_callback(f"[INFO] Traitement du sous-sitemap: {sub_sitemap_url}")
+            get_sitemap_urls(sub_sitemap_url, collector, matcher, log_callback)
+        return
+    
+    # Sinon, un <urlset>
+    elif root_tag == "urlset":
+        urls = [u.strip() for u in _LOC_XP(root)]
+        # Filtrer les URLs autorisées (inutile d'aller au-delà de la limite)
+        remaining = collector.limit - len(collector) if collector.limit > 0 else 0
+        allowed_urls = filter_allowed_urls(urls, matcher, remaining)
         # Ajouter au collector
         collector.add_urls(allowed_urls)
         if log_callback:
             log_callback(f"[INFO] Ajout de {len(allowed_urls)} URLs autorisées depuis {sitemap_url}")
-        return collector.urls
+        return
     
     # Si aucun <sitemapindex> ni <urlset>
     message = f"[WARN] '{sitemap_url}' n'est pas un sitemapindex ni un urlset reconnu."
     logging.warning(message)
     if log_callback:
         log_callback(message)
-    return collector.urls
 
 def get_allowed_urls(sitemap_or_url: str, disallowed: list, limit=0, log_callback=None) -> list:
     """
@@ -124,216 +300,556 @@ def get_allowed_urls(sitemap_or_url: str, disallowed: list, limit=0, log_callbac
     4. Retourner la liste finale, limitée si nécessaire.
     """
     collector = URLCollector(limit)
+    matcher = build_disallowed_matcher(disallowed)
     if ".xml" in sitemap_or_url.lower():
-        get_sitemap_urls(sitemap_or_url, collector, disallowed, log_callback)
+        get_sitemap_urls(sitemap_or_url, collector, matcher, log_callback)
     else:
-        if is_allowed(sitemap_or_url, disallowed):
+        if is_allowed(sitemap_or_url, matcher):
             collector.add_urls([sitemap_or_url])
             if log_callback:
                 log_callback(f"[INFO] Ajout de l'URL unique: {sitemap_or_url}")
     return collector.urls
 
-def scrape_content(url: str, min_delay: float, max_delay: float,
-                   pause_event: threading.Event,
-                   stop_event: threading.Event,
-                   log_callback=None,
-                   js_enabled=False) -> dict:
+def _element_text(element) -> str:
+    """Équivalent de get_text(strip=True) de BeautifulSoup pour un élément lxml."""
+    return "".join(text.strip() for text in _TEXT_XP(element))
+
+@functools.lru_cache(maxsize=16)
+def _html_parser(charset: str):
+    """Parseur HTML qui impose 'charset' (None si l'encodage est inconnu)."""
+    try:
+        return lxml.html.HTMLParser(encoding=charset)
+    except LookupError:
+        return None
+
+def parse_content(url: str, content, charset=None) -> dict:
     """
-    Scrape le contenu d'une page (titres, paragraphes, images, métadonnées).
-    Retourne un dict. Gère pause/arrêt en vérifiant pause_event/stop_event.
-    Ajoute l'exécution JavaScript via Playwright si js_enabled est True.
+    Extrait titres, paragraphes, images et métadonnées d'une page déjà
+    téléchargée. Fonction pure, exécutable dans un ProcessPoolExecutor.
+    Retourne un dict vide si le document est vide.
+    
+    'content' est normalement le corps brut de la réponse (bytes), décodé
+    par libxml2 selon 'charset' (celui de l'en-tête Content-Type). Sans
+    charset déclaré, libxml2 détecte l'encodage (BOM, <meta charset>).
+    Le HTML rendu par Playwright (str) est ré-encodé en UTF-8.
     """
-    # Vérifier 'Stop' avant de commencer
-    if stop_event.is_set():
+    try:
+        if isinstance(content, str):
+            # Le <meta charset> d'origine ne décrit plus ces octets : imposer UTF-8
+            tree = lxml.html.fromstring(content.encode('utf-8'), parser=_UTF8_HTML_PARSER)
+        else:
+            parser = _html_parser(charset.lower()) if charset else None
+            tree = lxml.html.fromstring(content, parser=parser)
+    except etree.ParserError:
         return {}
     
-    # Vérifier 'Pause'
-    while pause_event.is_set():
-        time.sleep(0.2)
-        if stop_event.is_set():
-            return {}
-
-    if js_enabled:
-        # Utilisation de Playwright pour exécuter JavaScript
-        try:
-            from playwright.sync_api import sync_playwright
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-                page.goto(url, wait_until="networkidle")
-                # Récupérer le contenu rendu
-                content = page.content()
-                browser.close()
-            message = f"[OK] Scraping (JS) de: {url}"
-            logging.info(message)
-            if log_callback:
-                log_callback(message)
-        except Exception as e:
-            message = f"[ERREUR] Playwright a échoué pour {url}: {e}"
-            logging.error(message)
-            if log_callback:
-                log_callback(message)
-            return {}
-        soup = BeautifulSoup(content, 'html.parser')
-    else:
-        headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            message = f"[OK] Scraping de: {url} (status={response.status_code})"
-            logging.info(message)
-            if log_callback:
-                log_callback(message)
-        except requests.RequestException as e:
-            message = f"[ERREUR] Échec requête: {url} -> {e}"
-            logging.error(message)
-            if log_callback:
-                log_callback(message)
-            return {}
-        soup = BeautifulSoup(response.text, 'html.parser')
-    
     # Titres
-    headings_tags = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-    headings = [tag.get_text(strip=True) for tag in headings_tags]
+    headings = [_element_text(tag) for tag in _HEADINGS_XP(tree)]
     
     # Paragraphes
-    paragraphs_tags = soup.find_all('p')
-    paragraphs = [p.get_text(strip=True) for p in paragraphs_tags if p.get_text(strip=True)]
+    paragraphs = [text for text in map(_element_text, _PARAGRAPHS_XP(tree)) if text]
     
-    # Images (src + alt)
-    images_tags = soup.find_all('img', src=True)
+    # Images (src + alt) ; les cas courants évitent un urljoin complet.
+    # Un src non imprimable (\t, \r, \n, caractères de contrôle) passe par
+    # urljoin, qui retire ces caractères comme les navigateurs.
+    base = urlsplit(url)
+    base_prefix = f"{base.scheme}://{base.netloc}"
     images = []
-    for img in images_tags:
-        src_abs = urljoin(url, img['src'])
+    for img in _IMAGES_XP(tree):
+        src = img.get('src')
+        if not src.isprintable():
+            src_abs = urljoin(url, src)
+        elif src.startswith(('http://', 'https://', '//')):
+            host_start = src.index('//') + 2
+            if src[host_start:host_start + 1] in ('', '/'):
+                # Sans hôte ('http://', '//', '///...'), laisser urljoin trancher
+                src_abs = urljoin(url, src)
+            elif host_start == 2:
+                src_abs = base.scheme + ':' + src
+            else:
+                src_abs = src
+        elif src.startswith('/') and '/.' not in src:
+            src_abs = base_prefix + src
+        else:
+            src_abs = urljoin(url, src)
         alt = img.get('alt', '')
         images.append({'src': src_abs, 'alt': alt})
     
-    # Métadonnées
-    meta_description = ""
-    meta_keywords = ""
-    meta_og_title = ""
-    
-    desc_tag = soup.find('meta', attrs={'name': 'description'})
-    if desc_tag and 'content' in desc_tag.attrs:
-        meta_description = desc_tag['content']
-    
-    keywords_tag = soup.find('meta', attrs={'name': 'keywords'})
-    if keywords_tag and 'content' in keywords_tag.attrs:
-        meta_keywords = keywords_tag['content']
-    
-    og_title_tag = soup.find('meta', property='og:title')
-    if og_title_tag and 'content' in og_title_tag.attrs:
-        meta_og_title = og_title_tag['content']
-    
-    # Vérifier 'Stop'/'Pause' avant d'attendre
-    if stop_event.is_set():
-        return {}
-    while pause_event.is_set():
-        time.sleep(0.2)
-        if stop_event.is_set():
-            return {}
-    
-    # Respect d'un délai aléatoire
-    delay = random.uniform(min_delay, max_delay)
-    if log_callback:
-        log_callback(f"[INFO] Pause de {delay:.2f} secondes avant la prochaine requête.")
-    time.sleep(delay)
+    # Métadonnées : un seul parcours des <meta>, la première balise trouvée
+    # pour chaque champ l'emporte (comme soup.find)
+    metas = {}
+    for meta in _META_XP(tree):
+        attrs = meta.attrib
+        for key in (('name', attrs.get('name')), ('property', attrs.get('property'))):
+            field = _META_FIELDS.get(key)
+            if field and field not in metas:
+                metas[field] = attrs.get('content', '')
+        if len(metas) == len(_META_FIELDS):
+            break
     
     return {
         'url': url,
         'headings': headings,
         'paragraphs': paragraphs,
         'images': images,
-        'meta_description': meta_description,
-        'meta_keywords': meta_keywords,
-        'meta_og_title': meta_og_title
+        'meta_description': metas.get('meta_description', ""),
+        'meta_keywords': metas.get('meta_keywords', ""),
+        'meta_og_title': metas.get('meta_og_title', "")
     }
 
+def render_page(browser_context, url: str) -> str:
+    """Ouvre un nouvel onglet dans le contexte Playwright et retourne le HTML rendu."""
+    page = browser_context.new_page()
+    try:
+        page.goto(url, wait_until="networkidle")
+        return page.content()
+    finally:
+        page.close()
+
+def _wait_while_paused(resume_event: threading.Event, stop_event: threading.Event) -> bool:
+    """
+    Bloque tant que resume_event est effacé (pause), avec réveil immédiat à
+    la reprise. Retourne False si l'arrêt est demandé.
+    """
+    if stop_event.is_set():
+        return False
+    while not resume_event.wait(timeout=1.0):
+        if stop_event.is_set():
+            return False
+    # on_stop lève aussi resume_event pour réveiller les workers en pause
+    return not stop_event.is_set()
+
+def fetch_content(url: str, browser_context, bucket,
+                  resume_event: threading.Event,
+                  stop_event: threading.Event,
+                  log_callback=None):
+    """
+    Rend une page avec Playwright (JavaScript exécuté) dans 'browser_context'
+    et retourne son HTML, sans l'analyser.
+    Retourne None en cas d'échec ou d'arrêt. Gère pause/arrêt via
+    resume_event (effacé = en pause) et stop_event.
+    Attend un jeton de 'bucket' (TokenBucket partagé, ou None) avant la requête.
+    """
+    # Vérifier 'Stop' puis 'Pause' avant de commencer
+    if not _wait_while_paused(resume_event, stop_event):
+        return None
+    
+    # Respect du débit global
+    if bucket is not None:
+        delay = bucket.reserve()
+        if delay > 0:
+            if log_callback:
+                log_callback(f"[INFO] Pause de {delay:.2f} secondes avant la prochaine requête.")
+            # Attente interrompue dès que 'Stop' est cliqué
+            if stop_event.wait(delay):
+                return None
+            # Une pause a pu commencer pendant l'attente
+            if not _wait_while_paused(resume_event, stop_event):
+                return None
+    
+    try:
+        content = render_page(browser_context, url)
+        message = f"[OK] Scraping (JS) de: {url}"
+        logging.info(message)
+        if log_callback:
+            log_callback(message)
+        return content
+    except Exception as e:
+        message = f"[ERREUR] Playwright a échoué pour {url}: {e}"
+        logging.error(message)
+        if log_callback:
+            log_callback(message)
+        return None
+
 def scrape_all_urls(urls, min_delay=1.0, max_delay=3.0, workers=1,
                    progress_callback=None,
-                   pause_event=None,
+                   resume_event=None,
                    stop_event=None,
                    log_callback=None,
                    data_callback=None,
-                   js_enabled=False):  # Ajout du paramètre js_enabled
+                   js_enabled=False,  # Ajout du paramètre js_enabled
+                   csv_filename=None,
+                   json_filename=None):
     """
-    Scrape toutes les URLs en utilisant ThreadPoolExecutor.
-    Gère pause/arrêt via pause_event et stop_event.
-    Retourne une liste de dicts.
+    Scrape toutes les URLs. Sans JavaScript, délègue à scrape_all_async.
+    Avec JavaScript, les pages sont rendues par Playwright dans un
+    ThreadPoolExecutor et parsées dans un ProcessPoolExecutor, pour
+    utiliser tous les cœurs malgré le GIL.
+    Gère pause/arrêt via resume_event (effacé = en pause) et stop_event.
+    Si csv_filename/json_filename sont fournis, chaque résultat y est écrit
+    dès qu'il arrive (voir ResultWriter).
+    Retourne une liste de dicts (vide si data_callback est fourni : les
+    résultats ne sont alors conservés que par l'appelant).
     """
+    if not js_enabled:
+        return asyncio.run(scrape_all_async(urls, min_delay, max_delay, workers,
+                                            progress_callback=progress_callback,
+                                            resume_event=resume_event,
+                                            stop_event=stop_event,
+                                            log_callback=log_callback,
+                                            data_callback=data_callback,
+                                            csv_filename=csv_filename,
+                                            json_filename=json_filename))
+    
     results = []
     total = len(urls)
     if total == 0:
         return results
     
-    if pause_event is None:
-        pause_event = threading.Event()
+    if resume_event is None:
+        resume_event = threading.Event()
+        resume_event.set()
     if stop_event is None:
         stop_event = threading.Event()
     
-    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
-        future_to_url = {
-            executor.submit(
-                scrape_content, url, min_delay, max_delay, pause_event, stop_event, log_callback, js_enabled
-            ): url
-            for url in urls
-        }
-        
-        for i, future in enumerate(concurrent.futures.as_completed(future_to_url), start=1):
-            url = future_to_url[future]
+    bucket = TokenBucket.from_delays(min_delay, max_delay)
+    scrape_args = (bucket, resume_event, stop_event, log_callback)
+    
+    # Le pool de processus est fermé en dernier : les threads encore actifs
+    # peuvent y soumettre leur parsing jusqu'à leur fin.
+    with concurrent.futures.ProcessPoolExecutor() as process_pool, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor, \
+            ResultWriter(csv_filename, json_filename) as writer:
+        outcomes = _run_js_workers(executor, process_pool, urls, workers, scrape_args)
+        for i, (url, outcome) in enumerate(outcomes, start=1):
             if stop_event.is_set():
                 # Si "Arrêter" est cliqué, on abandonne les futures restantes
                 break
-            
+            _record_outcome(i, total, url, outcome, writer, results,
+                            progress_callback, log_callback, data_callback)
+    
+    return results
+
+def _record_outcome(i, total, url, outcome, writer, results,
+                    progress_callback=None, log_callback=None, data_callback=None):
+    """
+    Traite le résultat (dict ou exception) de la i-ème URL terminée :
+    écriture via 'writer', conservation (data_callback ou 'results'),
+    progression et log. Partagé par scrape_all_urls et scrape_all_async.
+    """
+    if isinstance(outcome, Exception):
+        msg = f"[{i}/{total}] Exception pour {url}: {outcome}"
+    elif outcome:
+        writer.write(outcome)
+        msg = f"[{i}/{total}] OK: {url}"
+        if data_callback:
+            data_callback(outcome)  # Append data to scraped_data
+        else:
+            results.append(outcome)
+    else:
+        msg = f"[{i}/{total}] Échec ou annulé: {url}"
+    
+    logging.info(msg)
+    if progress_callback:
+        progress_callback(i, total, msg)
+    if log_callback:
+        log_callback(msg)
+
+def _iter_completed(future_to_url):
+    """Produit des tuples (url, dict ou exception) dans l'ordre de complétion."""
+    for future in concurrent.futures.as_completed(future_to_url):
+        url = future_to_url[future]
+        try:
+            yield url, future.result()
+        except Exception as exc:
+            yield url, exc
+
+def _parse_in_pool(process_pool, url, content, result_future):
+    """
+    Soumet le parsing de 'content' au pool de processus et reporte son
+    résultat (ou son exception) dans result_future.
+    """
+    if content is None:
+        result_future.set_result({})
+        return
+    
+    def on_parsed(parse_future):
+        try:
+            result_future.set_result(parse_future.result())
+        except Exception as exc:
+            result_future.set_exception(exc)
+    
+    try:
+        process_pool.submit(parse_content, url, content).add_done_callback(on_parsed)
+    except Exception as exc:
+        result_future.set_exception(exc)
+
+def _run_js_workers(executor, process_pool, urls, workers, scrape_args):
+    """
+    Lance au plus 'workers' threads qui dépilent une file d'URLs commune,
+    chacun avec son propre navigateur Playwright (l'API sync est liée au
+    thread qui l'a créée). Produit des tuples (url, dict ou exception).
+    """
+    url_queue = queue.Queue()
+    future_to_url = {}
+    for url in urls:
+        result_future = concurrent.futures.Future()
+        future_to_url[result_future] = url
+        url_queue.put((url, result_future))
+    for _ in range(min(workers, len(urls))):
+        executor.submit(_js_worker, url_queue, process_pool, scrape_args)
+    yield from _iter_completed(future_to_url)
+
+def _js_worker(url_queue, process_pool, scrape_args):
+    """
+    Lance Chromium une seule fois et le réutilise (un onglet par URL)
+    jusqu'à ce que la file soit vide. Le HTML rendu est parsé dans le pool
+    de processus. Chaque URL reçoit exactement un résultat, même si le
+    lancement échoue.
+    """
+    log_callback = scrape_args[-1]
+    playwright = browser = browser_context = None
+    try:
+        from playwright.sync_api import sync_playwright
+        playwright = sync_playwright().start()
+        browser = playwright.chromium.launch(headless=True)
+        browser_context = browser.new_context()
+    except Exception as e:
+        message = f"[ERREUR] Impossible de lancer Playwright: {e}"
+        logging.error(message)
+        if log_callback:
+            log_callback(message)
+    
+    try:
+        while True:
             try:
-                data = future.result()
-                if data:
-                    results.append(data)
-                    msg = f"[{i}/{total}] OK: {url}"
-                    if data_callback:
-                        data_callback(data)  # Append data to scraped_data
-                else:
-                    msg = f"[{i}/{total}] Échec ou annulé: {url}"
+                url, result_future = url_queue.get_nowait()
+            except queue.Empty:
+                return
+            if browser_context is None:
+                result_future.set_result({})
+                continue
+            try:
+                content = fetch_content(url, browser_context, *scrape_args)
             except Exception as exc:
-                msg = f"[{i}/{total}] Exception pour {url}: {exc}"
-            
-            logging.info(msg)
-            if progress_callback:
-                progress_callback(i, total, msg)
-            if log_callback:
-                log_callback(msg)
+                result_future.set_exception(exc)
+                continue
+            _parse_in_pool(process_pool, url, content, result_future)
+    finally:
+        if browser is not None:
+            browser.close()
+        if playwright is not None:
+            playwright.stop()
+
+def _make_dns_resolver():
+    """
+    Résolveur c-ares (aiodns) si disponible, sinon le résolveur par threads
+    d'aiohttp. Doit être appelé depuis la boucle asyncio.
+    """
+    try:
+        return aiohttp.AsyncResolver()
+    except RuntimeError:
+        return aiohttp.ThreadedResolver()
+
+async def fetch_url_async(url: str, session: aiohttp.ClientSession, log_callback=None):
+    """
+    Télécharge une page via aiohttp.
+    Retourne le contenu brut (bytes) et le charset de l'en-tête Content-Type
+    (None s'il n'est pas déclaré), ou None en cas d'échec.
+    """
+    try:
+        async with session.get(url) as response:
+            response.raise_for_status()
+            content = await response.read()
+            charset = response.charset
+        message = f"[OK] Scraping de: {url} (status={response.status})"
+        logging.info(message)
+        if log_callback:
+            log_callback(message)
+        return content, charset
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        message = f"[ERREUR] Échec requête: {url} -> {e}"
+        logging.error(message)
+        if log_callback:
+            log_callback(message)
+        return None
+
+async def scrape_all_async(urls, min_delay=1.0, max_delay=3.0, workers=1,
+                           progress_callback=None,
+                           resume_event=None,
+                           stop_event=None,
+                           log_callback=None,
+                           data_callback=None,
+                           csv_filename=None,
+                           json_filename=None):
+    """
+    Équivalent asynchrone de scrape_all_urls (sans JavaScript).
+    Les requêtes partagent une seule boucle asyncio et un seul pool de
+    connexions aiohttp ; 'workers' borne le nombre de requêtes simultanées.
+    Le parsing est délégué à un ProcessPoolExecutor.
+    Les résultats sont écrits au fil de l'eau comme dans scrape_all_urls.
+    Retourne une liste de dicts (vide si data_callback est fourni : les
+    résultats ne sont alors conservés que par l'appelant).
+    """
+    results = []
+    total = len(urls)
+    if total == 0:
+        return results
+    
+    if resume_event is None:
+        resume_event = threading.Event()
+        resume_event.set()
+    if stop_event is None:
+        stop_event = threading.Event()
+    
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(workers)
+    bucket = TokenBucket.from_delays(min_delay, max_delay)
+    
+    async def wait_if_paused():
+        """Attend la fin de la pause. Retourne False si l'arrêt est demandé."""
+        if stop_event.is_set():
+            return False
+        # L'attente bloquante se fait hors de la boucle asyncio
+        while not resume_event.is_set():
+            if await loop.run_in_executor(None, resume_event.wait, 1.0):
+                break
+            if stop_event.is_set():
+                return False
+        # on_stop lève aussi resume_event pour réveiller les workers en pause
+        return not stop_event.is_set()
+    
+    async def scrape_one(url, session, process_pool):
+        """Retourne (url, dict) ou (url, exception)."""
+        try:
+            async with semaphore:
+                if not await wait_if_paused():
+                    return url, {}
+                
+                # Respect du débit global
+                if bucket is not None:
+                    delay = bucket.reserve()
+                    if delay > 0:
+                        if log_callback:
+                            log_callback(f"[INFO] Pause de {delay:.2f} secondes avant la prochaine requête.")
+                        await asyncio.sleep(delay)
+                        # Une pause a pu commencer pendant l'attente
+                        if not await wait_if_paused():
+                            return url, {}
+                    if stop_event.is_set():
+                        return url, {}
+                
+                fetched = await fetch_url_async(url, session, log_callback)
+                if fetched is None:
+                    return url, {}
+                content, charset = fetched
+                data = await loop.run_in_executor(process_pool, parse_content, url, content, charset)
+                return url, data
+        except Exception as exc:
+            return url, exc
+    
+    resolver = _make_dns_resolver()
+    connector = aiohttp.TCPConnector(limit=100, use_dns_cache=True,
+                                     ttl_dns_cache=DNS_CACHE_TTL,
+                                     resolver=resolver)
+    timeout = aiohttp.ClientTimeout(total=None,
+                                    sock_connect=REQUEST_TIMEOUT[0],
+                                    sock_read=REQUEST_TIMEOUT[1])
+    try:
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers={"User-Agent": USER_AGENT}) as session:
+            with concurrent.futures.ProcessPoolExecutor() as process_pool, \
+                    ResultWriter(csv_filename, json_filename) as writer:
+                tasks = [asyncio.create_task(scrape_one(url, session, process_pool)) for url in urls]
+                try:
+                    for i, next_done in enumerate(asyncio.as_completed(tasks), start=1):
+                        url, outcome = await next_done
+                        if stop_event.is_set():
+                            # Si "Arrêter" est cliqué, on abandonne les tâches restantes
+                            break
+                        _record_outcome(i, total, url, outcome, writer, results,
+                                        progress_callback, log_callback, data_callback)
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        # Le connecteur ne ferme pas un résolveur qu'il n'a pas créé lui-même
+        await resolver.close()
     
     return results
 
+CSV_FIELDNAMES = [
+    'url',
+    'headings',
+    'paragraphs',
+    'images',
+    'meta_description',
+    'meta_keywords',
+    'meta_og_title'
+]
+
+def _csv_row(item: dict) -> dict:
+    """Les listes/dicts sont encodés en JSON pour éviter les problèmes de séparateur."""
+    return {
+        'url': item['url'],
+        'headings': orjson.dumps(item['headings']).decode('utf-8'),
+        'paragraphs': orjson.dumps(item['paragraphs']).decode('utf-8'),
+        'images': orjson.dumps(item['images']).decode('utf-8'),
+        'meta_description': item['meta_description'],
+        'meta_keywords': item['meta_keywords'],
+        'meta_og_title': item['meta_og_title']
+    }
+
+class ResultWriter:
+    """
+    Écrit les résultats au fil de l'eau dans un CSV et/ou un tableau JSON,
+    sans construire la liste complète en mémoire.
+    Les fichiers sont vidés sur disque toutes les 'flush_every' lignes.
+    """
+    def __init__(self, csv_filename=None, json_filename=None, flush_every=50):
+        self.flush_every = flush_every
+        self.count = 0
+        self._csv_file = None
+        self._csv_writer = None
+        self._json_file = None
+        if csv_filename:
+            self._csv_file = open(csv_filename, 'w', newline='', encoding='utf-8')
+            self._csv_writer = csv.DictWriter(self._csv_file, fieldnames=CSV_FIELDNAMES)
+            self._csv_writer.writeheader()
+        if json_filename:
+            self._json_file = open(json_filename, 'wb')
+            self._json_file.write(b"[")
+    
+    def write(self, item):
+        """Ajoute un résultat aux fichiers ouverts."""
+        if self._csv_writer:
+            self._csv_writer.writerow(_csv_row(item))
+        if self._json_file:
+            if self.count:
+                self._json_file.write(b",")
+            self._json_file.write(b"\n" + orjson.dumps(item))
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self.flush()
+    
+    def flush(self):
+        for f in (self._csv_file, self._json_file):
+            if f:
+                f.flush()
+    
+    def close(self):
+        """Termine le tableau JSON et ferme les fichiers."""
+        if self._csv_file:
+            self._csv_file.close()
+        if self._json_file:
+            self._json_file.write(b"\n]\n")
+            self._json_file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
 def save_results_to_csv(data_list, csv_filename):
     """
     Sauvegarde les résultats dans un fichier CSV.
     Les listes/dicts sont encodés en JSON pour éviter les problèmes de séparateur.
     """
-    fieldnames = [
-        'url',
-        'headings',
-        'paragraphs',
-        'images',
-        'meta_description',
-        'meta_keywords',
-        'meta_og_title'
-    ]
-    
-    with open(csv_filename, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
+    with ResultWriter(csv_filename=csv_filename) as writer:
         for item in data_list:
-            row = {
-                'url': item['url'],
-                'headings': json.dumps(item['headings'], ensure_ascii=False),
-                'paragraphs': json.dumps(item['paragraphs'], ensure_ascii=False),
-                'images': json.dumps(item['images'], ensure_ascii=False),
-                'meta_description': item['meta_description'],
-                'meta_keywords': item['meta_keywords'],
-                'meta_og_title': item['meta_og_title']
-            }
-            writer.writerow(row)
+            writer.write(item)
     
     message = f"[FIN] {len(data_list)} lignes sauvegardées dans {csv_filename}"
     logging.info(message)
@@ -344,8 +860,9 @@ def save_results_to_json(data_list, json_filename):
     Save the scraping results in a JSON file.
     """
     try:
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(data_list, f, ensure_ascii=False, indent=4)
+        # orjson produit directement de l'UTF-8 (non-ASCII conservé)
+        with open(json_filename, 'wb') as f:
+            f.write(orjson.dumps(data_list, option=orjson.OPT_INDENT_2))
         message = f"[FIN] Données sauvegardées en JSON dans '{json_filename}'"
         logging.info(message)
         return message
@@ -358,13 +875,17 @@ def save_results_to_json(data_list, json_filename):
 
 # 2. Interface Tkinter 
 
+LOG_DRAIN_INTERVAL_MS = 100  # fréquence d'affichage des logs
+LOG_BATCH_SIZE = 200         # messages insérés au plus par affichage
+
 class ScraperGUI:
     def __init__(self, root):
         self.root = root
         root.title("Web Scraper")
     
         # Events pour pause/arrêt
-        self.pause_event = threading.Event()  # True => en pause
+        self.resume_event = threading.Event()  # Effacé => en pause
+        self.resume_event.set()
         self.stop_event = threading.Event()   # True => arrêt demandé
         self.is_paused = False
     
@@ -478,6 +999,10 @@ class ScraperGUI:
         root.rowconfigure(1, weight=1)
         root.columnconfigure(0, weight=1)
     
+        # Messages de log en attente d'affichage (alimentée par les workers)
+        self.log_queue = queue.Queue()
+        self._drain_logs()
+    
     def browse_csv(self):
         """Ouvre une boîte de dialogue pour choisir le fichier CSV de sortie."""
         filename = filedialog.asksaveasfilename(
@@ -488,13 +1013,27 @@ class ScraperGUI:
             self.csv_var.set(filename)
     
     def log_to_gui(self, message):
-        """Insère un message dans la zone de statut."""
-        def append_msg():
+        """Ajoute un message à la file ; il sera affiché par _drain_logs."""
+        self.log_queue.put(message)
+    
+    def _drain_logs(self):
+        """
+        Vide la file de messages (au plus LOG_BATCH_SIZE à la fois) en une
+        seule insertion dans la zone de statut, puis se replanifie.
+        Exécuté uniquement dans le thread Tk.
+        """
+        batch = []
+        try:
+            while len(batch) < LOG_BATCH_SIZE:
+                batch.append(self.log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if batch:
             self.status_text.config(state="normal")
-            self.status_text.insert(tk.END, message + "\n")
+            self.status_text.insert(tk.END, "\n".join(batch) + "\n")
             self.status_text.config(state="disabled")
             self.status_text.see(tk.END)
-        self.root.after(0, append_msg)
+        self.root.after(LOG_DRAIN_INTERVAL_MS, self._drain_logs)
     
     def on_start(self):
         """Démarre le scraping dans un thread séparé."""
@@ -504,7 +1043,7 @@ class ScraperGUI:
         self.status_text.config(state="disabled")
         
         # Réinitialiser les events
-        self.pause_event.clear()
+        self.resume_event.set()
         self.stop_event.clear()
         self.is_paused = False
         self.pause_button.config(text="Pause")
@@ -581,25 +1120,26 @@ class ScraperGUI:
                     with self.data_lock:
                         self.scraped_data.append(data)
                 
-                scraped_data = scrape_all_urls(
+                # asyncio/aiohttp sans JavaScript, threads Playwright sinon
+                scrape_all_urls(
                     urls,
                     min_delay=min_delay,
                     max_delay=max_delay,
                     workers=workers,
                     progress_callback=progress_callback,
-                    pause_event=self.pause_event,
+                    resume_event=self.resume_event,
                     stop_event=self.stop_event,
                     log_callback=self.log_to_gui,
                     data_callback=data_callback,
-                    js_enabled=js_enabled
+                    js_enabled=js_enabled,
+                    csv_filename=csv_filename
                 )
                 
-                # 3) Sauvegarder le résultat (si pas d'arrêt)
+                # 3) Les résultats ont été écrits dans le CSV au fil de l'eau
                 if not self.stop_event.is_set():
-                    save_results_to_csv(scraped_data, csv_filename)
                     self.log_to_gui(f"[FIN] Scraping terminé. Résultats dans '{csv_filename}'")
                 else:
-                    self.log_to_gui("[INFO] Scraping interrompu par l'utilisateur.")
+                    self.log_to_gui(f"[INFO] Scraping interrompu par l'utilisateur. Résultats partiels dans '{csv_filename}'")
             
             finally:
                 self.executor = None
@@ -626,19 +1166,20 @@ class ScraperGUI:
         if not self.is_paused:
             # Passer en pause
             self.is_paused = True
-            self.pause_event.set()
+            self.resume_event.clear()
             self.pause_button.config(text="Reprendre")
             self.log_to_gui("[INFO] Scraping mis en pause.")
         else:
             # Reprendre
             self.is_paused = False
-            self.pause_event.clear()
+            self.resume_event.set()
             self.pause_button.config(text="Pause")
             self.log_to_gui("[INFO] Reprise du scraping.")
     
     def on_stop(self):
         """Demande l'arrêt du scraping."""
         self.stop_event.set()
+        self.resume_event.set()  # Réveiller les workers en pause pour qu'ils voient l'arrêt
         self.log_to_gui("[INFO] Arrêt demandé. Les tâches en attente seront annulées.")
     
         # Tente d'annuler les futures non commencées
@@ -714,13 +1255,10 @@ class ScraperGUI:
             self.log_to_gui("[ERREUR] Nom de fichier JSON invalide.")
             return
 
-    # Save JSON
-        try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(self.scraped_data, f, ensure_ascii=False, indent=4)
-            self.log_to_gui(f"[FIN] Données sauvegardées en JSON dans '{filename}'")
-        except Exception as e:
-            self.log_to_gui(f"[ERREUR] Échec de la sauvegarde JSON: {e}")
+        # Save JSON
+        with self.data_lock:
+            data_to_save = list(self.scraped_data)
+        self.log_to_gui(save_results_to_json(data_to_save, filename))
 
 
 def main():